@@ -0,0 +1,142 @@
+"""
+Combine a bootloader .bin and an application .bin into a single UF2 image
+that can be dropped onto the Pico in BOOTSEL mode.
+
+Blocks are emitted with the absolute family ID so the bootloader and the
+application land at their exact flash addresses.
+
+Usage:
+
+    python create_combined_bin.py -b ./build/bootloader.bin -a ./build/app.bin -o ./build/combined.uf2
+"""
+
+import argparse
+import struct
+
+try:
+    import numpy as np  # 3rd party package, vectorized block generation
+except ImportError:
+    np = None
+
+UF2_MAGIC_START0 = 0x0A324655
+UF2_MAGIC_START1 = 0x9E5D5157
+UF2_MAGIC_END = 0x0AB16F30
+UF2_FLAG_FAMILY_ID = 0x00002000
+UF2_BLOCK_SIZE = 512
+UF2_DATA_SIZE = 256
+
+# "absolute" family: blocks are flashed at their exact target address on both
+# RP2040 and RP2350
+RP2XXX_ABSOLUTE_FAMILY_ID = 0xE48BFF57
+
+FLASH_BASE_ADDRESS = 0x10000000
+DEFAULT_BOOTLOADER_ADDRESS = FLASH_BASE_ADDRESS
+DEFAULT_APP_ADDRESS = 0x10040000
+
+# The 8 header words share the same layout for every block; parse the format
+# string once at import instead of once per block.
+_UF2_HEADER = struct.Struct('<8I')
+_UF2_FOOTER = struct.pack('<I', UF2_MAGIC_END)
+
+
+def create_uf2_block(address, data, block_no, total_blocks):
+    block = bytearray(UF2_BLOCK_SIZE)
+    _UF2_HEADER.pack_into(block, 0,
+                          UF2_MAGIC_START0,
+                          UF2_MAGIC_START1,
+                          UF2_FLAG_FAMILY_ID,
+                          address,
+                          UF2_DATA_SIZE,
+                          block_no,
+                          total_blocks,
+                          RP2XXX_ABSOLUTE_FAMILY_ID)
+    # The bytearray is already zero-initialized, so a short final chunk is
+    # padded for free by only assigning the bytes we have.
+    block[32:32 + len(data)] = data
+    block[508:512] = _UF2_FOOTER
+    return block
+
+
+def write_uf2(filename, segments):
+    # Addresses and block numbers follow directly from the segment layout, so
+    # stream the blocks straight to the file rather than materialising an
+    # intermediate list of per-block dicts.
+    counts = [(len(data) + UF2_DATA_SIZE - 1) // UF2_DATA_SIZE for _, data in segments]
+    total_blocks = sum(counts)
+
+    with open(filename, 'wb') as fp:
+        block_no = 0
+        for (start_address, data), count in zip(segments, counts):
+            # Pad the segment to a page boundary once so every iteration
+            # handles an identical full-page chunk; skip the copy entirely
+            # when the segment is already page aligned.
+            if len(data) % UF2_DATA_SIZE:
+                data = data + b'\x00' * (-len(data) % UF2_DATA_SIZE)
+            for i in range(count):
+                chunk = data[i * UF2_DATA_SIZE:(i + 1) * UF2_DATA_SIZE]
+                fp.write(create_uf2_block(start_address + i * UF2_DATA_SIZE, chunk, block_no, total_blocks))
+                block_no += 1
+
+    return total_blocks
+
+
+def write_uf2_vectorized(filename, segments):
+    # Block generation is embarrassingly data parallel: only the address,
+    # block number and payload vary per block. Build the whole file as one
+    # (N, 512) uint8 array, fill the header words as uint32 columns and write
+    # it out in a single call.
+    counts = [(len(data) + UF2_DATA_SIZE - 1) // UF2_DATA_SIZE for _, data in segments]
+    total_blocks = sum(counts)
+
+    out = np.zeros((total_blocks, UF2_BLOCK_SIZE), dtype=np.uint8)
+    words = out.view(np.uint32)
+    words[:, 0] = UF2_MAGIC_START0
+    words[:, 1] = UF2_MAGIC_START1
+    words[:, 2] = UF2_FLAG_FAMILY_ID
+    words[:, 4] = UF2_DATA_SIZE
+    words[:, 5] = np.arange(total_blocks, dtype=np.uint32)
+    words[:, 6] = total_blocks
+    words[:, 7] = RP2XXX_ABSOLUTE_FAMILY_ID
+    words[:, 127] = UF2_MAGIC_END
+
+    block_no = 0
+    for (start_address, data), count in zip(segments, counts):
+        rows = slice(block_no, block_no + count)
+        words[rows, 3] = start_address + np.arange(count, dtype=np.uint32) * UF2_DATA_SIZE
+        padded = data + b'\x00' * (-len(data) % UF2_DATA_SIZE)
+        out[rows, 32:32 + UF2_DATA_SIZE] = np.frombuffer(padded, dtype=np.uint8).reshape(count, UF2_DATA_SIZE)
+        block_no += count
+
+    with open(filename, 'wb') as fp:
+        out.tofile(fp)
+
+    return total_blocks
+
+
+def main(bootloader_path, bootloader_address, app_path, app_address, output_path):
+    with open(bootloader_path, 'rb') as fp:
+        bootloader_data = fp.read()
+    with open(app_path, 'rb') as fp:
+        app_data = fp.read()
+
+    segments = [(bootloader_address, bootloader_data), (app_address, app_data)]
+    if np is not None:
+        total_blocks = write_uf2_vectorized(output_path, segments)
+    else:
+        total_blocks = write_uf2(output_path, segments)
+
+    print(f"Generated {output_path} ({total_blocks} blocks, "
+          f"bootloader: {len(bootloader_data)} bytes @ 0x{bootloader_address:08x}, "
+          f"app: {len(app_data)} bytes @ 0x{app_address:08x})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-b', '--bootloader', help="Path to the bootloader .bin", required=True)
+    parser.add_argument('-a', '--app', help="Path to the application .bin", required=True)
+    parser.add_argument('-o', '--output', help="Output path of the combined .uf2", required=True)
+    parser.add_argument('--bootloader-address', type=lambda x: int(x, 0), default=DEFAULT_BOOTLOADER_ADDRESS)
+    parser.add_argument('--app-address', type=lambda x: int(x, 0), default=DEFAULT_APP_ADDRESS)
+    args = parser.parse_args()
+
+    main(args.bootloader, args.bootloader_address, args.app, args.app_address, args.output)
@@ -0,0 +1,163 @@
+"""
+Upload a firmware image to the OpenTrickler OTA REST endpoints over WiFi.
+
+The firmware is sent in URL-safe base64 encoded chunks via GET /rest/ota_write,
+framed by /rest/ota_begin (size + SHA256 for final verification) and
+/rest/ota_end. With --post, chunks are sent as raw binary POST bodies
+instead, which requires firmware built with POST support
+(LWIP_HTTPD_SUPPORT_POST) and a payload limit covering the chunk size.
+
+Usage:
+
+    python ota_upload.py -f ./build/app.bin -a 192.168.4.1
+"""
+
+import argparse
+import base64
+import hashlib
+import mmap
+import os
+import sys
+import time
+
+import requests
+
+try:
+    import pybase64  # 3rd party package, SIMD accelerated base64 codec
+except ImportError:
+    pybase64 = None
+
+# Must keep the base64 GET query string within the stock request line limit
+# (LWIP_HTTPD_MAX_REQUEST_URI_LEN is 2048 in src/lwipopts.h): 1 KiB raw is
+# ~1368 URL-safe base64 characters plus the URL overhead, independent of the
+# chunk content. Devices that can take more advertise it via max_chunk in
+# /rest/ota_status.
+DEFAULT_CHUNK_SIZE = 1024
+REQUEST_TIMEOUT_S = 10
+PROGRESS_BAR_WIDTH = 40
+PROGRESS_INTERVAL_S = 0.1
+
+# pybase64 bundles SIMD (SSSE3/AVX2/NEON) encode kernels with runtime CPU
+# dispatch; fall back to the stdlib scalar encoder when it is not installed.
+# The URL-safe alphabet is required: '+' and '/' from the standard alphabet
+# get percent-escaped to 3 bytes each in the query string, which can triple
+# the request line for padding-heavy (e.g. 0xFF filled) chunks, while '-'
+# and '_' pass through untouched and keep the length content-independent.
+b64encode = pybase64.urlsafe_b64encode if pybase64 else base64.urlsafe_b64encode
+
+
+def calculate_sha256(firmware_path):
+    with open(firmware_path, 'rb') as fp:
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: tuned internal buffer, dispatches to the OpenSSL
+            # SHA extension fast path where the CPU supports it.
+            return hashlib.file_digest(fp, 'sha256').hexdigest()
+
+        # Fallback: map the file so OpenSSL hashes it in place, without a
+        # staging copy through Python-level read() buffers.
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
+
+def upload_firmware(address, firmware_path, use_post=False):
+    total_size = os.path.getsize(firmware_path)
+    if total_size == 0:
+        # mmap rejects empty files with an opaque internals error; report it
+        # ourselves before the hash and upload mappings are created.
+        raise ValueError(f"Empty firmware file: {firmware_path}")
+    sha256 = calculate_sha256(firmware_path)
+    base_url = f"http://{address}"
+
+    # Reuse a single connection (HTTP keep-alive) for the entire transfer. The
+    # on-device httpd serves one request at a time, so a persistent session
+    # removes the per-chunk TCP setup/teardown without needing request
+    # pipelining on the client side.
+    sess = requests.Session()
+
+    # Negotiate the chunk size: larger chunks amortise the per-request HTTP
+    # and Python overhead, and give the base64 encoder buffers large enough
+    # for its SIMD kernels to reach peak throughput. Older firmware without
+    # /rest/ota_status gets the default.
+    chunk_size = DEFAULT_CHUNK_SIZE
+    try:
+        status = sess.get(f"{base_url}/rest/ota_status", timeout=REQUEST_TIMEOUT_S).json()
+        chunk_size = int(status["max_chunk"])
+    except (requests.RequestException, ValueError, KeyError):
+        pass
+
+    resp = sess.get(f"{base_url}/rest/ota_begin",
+                    params={"size": total_size, "sha256": sha256},
+                    timeout=REQUEST_TIMEOUT_S)
+    resp.raise_for_status()
+
+    start_time = time.time()
+    next_print = 0.0
+    # Map the image instead of streaming read() calls: chunks are sliced
+    # straight out of the page cache and no read buffer is filled per chunk.
+    with open(firmware_path, 'rb') as fp, \
+            mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if not use_post:
+            # Default transport: base64 in a GET query string, matching the
+            # GET-only CGI layer in http_rest.c. Encode the whole mapped
+            # image in one call and slice the ASCII per chunk; rounding the
+            # chunk down to a multiple of 3 keeps every slice boundary on a
+            # whole base64 quantum, so only the final chunk carries padding.
+            chunk_size -= chunk_size % 3
+            all_b64 = b64encode(mm)
+
+        for offset in range(0, total_size, chunk_size):
+            if use_post:
+                # Raw bodies skip the ~1.4x base64 inflation plus URL
+                # escaping, but need firmware built with POST support and a
+                # payload limit covering the chunk size.
+                resp = sess.post(f"{base_url}/rest/ota_write",
+                                 params={"offset": offset},
+                                 data=mm[offset:offset + chunk_size],
+                                 headers={"Content-Type": "application/octet-stream"},
+                                 timeout=REQUEST_TIMEOUT_S)
+            else:
+                b64_start = offset * 4 // 3
+                if offset + chunk_size < total_size:
+                    b64_end = (offset + chunk_size) * 4 // 3
+                else:
+                    b64_end = len(all_b64)
+                resp = sess.get(f"{base_url}/rest/ota_write",
+                                params={"offset": offset, "data": all_b64[b64_start:b64_end].decode('ascii')},
+                                timeout=REQUEST_TIMEOUT_S)
+            # A bare 200 acknowledges the chunk; the device only produces a
+            # body (a short plain-text reason) on the error path, so there is
+            # no JSON to parse per chunk and the local offset tracks progress.
+            if resp.status_code != 200:
+                raise RuntimeError(f"Device rejected chunk at offset {offset}: "
+                                   f"{resp.status_code} {resp.text.strip()}")
+
+            # Rendering the bar and flushing the terminal every chunk is
+            # measurable Python-side work, so only refresh it a few times per
+            # second and once more after the final chunk.
+            written = min(offset + chunk_size, total_size)
+            now = time.monotonic()
+            if now >= next_print or written == total_size:
+                next_print = now + PROGRESS_INTERVAL_S
+                fill = int(PROGRESS_BAR_WIDTH * written / total_size)
+                bar = '=' * fill + ' ' * (PROGRESS_BAR_WIDTH - fill)
+                elapsed = time.time() - start_time
+                speed = written / elapsed / 1024 if elapsed > 0 else 0
+                sys.stdout.write(f"\r[{bar}] {written}/{total_size} bytes ({speed:.1f} KiB/s)")
+                sys.stdout.flush()
+
+    print()
+
+    resp = sess.get(f"{base_url}/rest/ota_end", timeout=REQUEST_TIMEOUT_S)
+    resp.raise_for_status()
+
+    print(f"Upload complete, device verifying image (sha256: {sha256})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-f', '--firmware', help="Path to the firmware .bin to upload", required=True)
+    parser.add_argument('-a', '--address', help="IP address or hostname of the OpenTrickler", default="192.168.4.1")
+    parser.add_argument('--post', help="Send raw binary POST bodies (requires firmware built with POST support)", default=False, action='store_true')
+    args = parser.parse_args()
+
+    upload_firmware(args.address, args.firmware, use_post=args.post)